@@ -10,22 +10,174 @@ Functions:
 - get_api_info - Retrieve API documentation
 - get_folders - List folders in Synology Photos
 - get_items - Retrieve photos and videos from folders
+- iter_items - Iterate over photos and videos of a folder
+- iter_items_concurrent - Iterate over a folder tree, listing folders in parallel
 - get_all_tags - Retrieve all tags from Synology Photos
+- get_tag_index - Get all tags indexed by name
 - get_tag - Get information about a specific tag
+- clear_tag_cache - Forget the cached tags after creating new ones
 - add_tag - Apply tags to photos or videos
+- get_session - Access the shared HTTP session used for all requests
 
 """
 
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Iterator, Tuple
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 import json
 import os
+import threading
 from urllib.parse import urljoin
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# orjson is optional, it speeds up parsing of large listings
+try:
+    import orjson
+    _json_loads = orjson.loads
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+
+# Maximum number of elements the API returns per list request
+PAGE_SIZE = 100
+
+# Maximum number of requests in flight at the same time, across all threads.
+# The session connection pool is sized to this limit so no connection is discarded.
+MAX_CONCURRENT_REQUESTS = 16
+
+# Default number of folders listed in parallel by each concurrent folder walk.
+# Requests of all walks together stay bounded by MAX_CONCURRENT_REQUESTS.
+MAX_WORKERS = 16
+
+# Maximum number of item IDs sent in a single add_tag request
+ADD_TAG_CHUNK_SIZE = 500
+
+# Maximum number of add_tag chunks sent in parallel by a single add_tag call
+ADD_TAG_WORKERS = 4
+
+# Timeout in seconds applied to every request sent to the Synology NAS
+REQUEST_TIMEOUT = 30
+
+# Transient errors are retried with an exponential backoff. The last response is
+# returned when retries are exhausted, so that it is reported as a SynologyPhotoError.
+_retries = Retry(
+    total=5,
+    backoff_factor=0.3,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=['GET', 'POST'],
+    raise_on_status=False,
+)
+
+# Shared session so that consecutive calls to the same host reuse their connection
+_session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=10, pool_maxsize=MAX_CONCURRENT_REQUESTS, max_retries=_retries)
+_request_slots = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+_session.mount('https://', _adapter)
+_session.mount('http://', _adapter)
+
+# Constant parameters of the requests issued for every folder of a folder walk
+_FOLDERS_PARAMS = {
+    'api': 'SYNO.Foto.Browse.Folder',
+    'version': 2,
+    'method': 'list',
+}
+_ITEMS_PARAMS = {
+    'api': 'SYNO.Foto.Browse.Item',
+    'version': 4,
+    'method': 'list',
+}
 
 class SynologyPhotoError(Exception):
     """Custom exception for Synology Photo API errors."""
     pass
 
+def get_session() -> requests.Session:
+    """Return the HTTP session shared by all API functions.
+
+    The session can be customized (headers, certificate verification, proxies...)
+    before calling the other functions of this library.
+
+    Returns:
+        requests.Session: The shared session.
+    """
+    return _session
+
+@lru_cache(maxsize=None)
+def _endpoint(path: str) -> str:
+    """Return the full URL of an API endpoint, computed once per path.
+
+    The base URL is read lazily so that scripts can load their environment
+    after importing this module.
+
+    Raises:
+        SynologyPhotoError: If SYNOLOGY_PHOTO_URL is not set. Nothing is cached then.
+    """
+    base_url = os.getenv('SYNOLOGY_PHOTO_URL')
+    if not base_url:
+        raise SynologyPhotoError("SYNOLOGY_PHOTO_URL environment variable is not set")
+    return urljoin(base_url, path)
+
+def _call(endpoint: str, params: Dict[str, Any], error_message: str, post: bool = False) -> Dict[str, Any]:
+    """Send a request to the Synology Photo API and return its data.
+
+    Args:
+        endpoint: URL of the API endpoint.
+        params: Request parameters.
+        error_message: Message prefix used if the API reports a failure.
+        post: If True, send the parameters as a POST form body instead of a GET query.
+
+    Returns:
+        Dict[str, Any]: The 'data' field of the response, empty if there is none.
+
+    Raises:
+        SynologyPhotoError: If the request fails (including timeouts and connection
+            errors) or the API reports a failure.
+    """
+    try:
+        with _request_slots:
+            if post:
+                response = _session.post(endpoint, data=params, timeout=REQUEST_TIMEOUT)
+            else:
+                response = _session.get(endpoint, params=params, timeout=REQUEST_TIMEOUT)
+    except requests.RequestException as e:
+        raise SynologyPhotoError(f"Request failed: {e}") from e
+    if response.status_code != 200:
+        raise SynologyPhotoError(f"Request failed: {response.status_code}")
+
+    data = _json_loads(response.content)
+    if not data['success']:
+        raise SynologyPhotoError(f"{error_message}: {data['error']['code']}")
+
+    return data.get('data', {})
+
+def _iter_pages(endpoint: str, params: Dict[str, Any], error_message: str, page_size: int = PAGE_SIZE) -> Iterator[Dict[str, Any]]:
+    """Iterate over all elements of a paginated list request.
+
+    Args:
+        endpoint: URL of the API endpoint.
+        params: Request parameters, without 'offset' and 'limit'.
+        error_message: Message prefix used if the API reports a failure.
+        page_size: Number of elements requested per page.
+
+    Yields:
+        Dict[str, Any]: Each element of the list, page after page.
+
+    Raises:
+        SynologyPhotoError: If any page request fails.
+    """
+    offset = 0
+    while True:
+        page_params = {**params, 'offset': offset, 'limit': page_size}
+        page = _call(endpoint, page_params, error_message)['list']
+        yield from page
+        if len(page) < page_size:
+            return
+        offset += page_size
+
 def authenticate(username: str, password: str) -> str:
     """Authenticate with the Synology Photo API.
 
@@ -39,7 +191,7 @@ def authenticate(username: str, password: str) -> str:
     Raises:
         SynologyPhotoError: If authentication fails or request fails.
     """
-    endpoint = urljoin(os.getenv('SYNOLOGY_PHOTO_URL'), 'webapi/auth.cgi')
+    endpoint = _endpoint('webapi/auth.cgi')
     params = {
         'api': 'SYNO.API.Auth',
         'version': 7,
@@ -47,15 +199,7 @@ def authenticate(username: str, password: str) -> str:
         'account': username,
         'passwd': password
     }
-    response = requests.get(endpoint, params=params)
-    if response.status_code != 200:
-        raise SynologyPhotoError(f"Request failed: {response.status_code}")
-
-    data = response.json()
-    if not data['success']:
-        raise SynologyPhotoError(f"Authentication failed: {data['error']['code']}")
-    
-    return data['data']['sid']
+    return _call(endpoint, params, "Authentication failed")['sid']
 
 def get_api_info() -> Dict[str, Any]:
     """Retrieve API information from Synology Photo API.
@@ -66,21 +210,13 @@ def get_api_info() -> Dict[str, Any]:
     Raises:
         SynologyPhotoError: If the API request fails.
     """
-    endpoint = urljoin(os.getenv('SYNOLOGY_PHOTO_URL'), 'webapi/query.cgi')
+    endpoint = _endpoint('webapi/query.cgi')
     params = {
         'api': 'SYNO.API.Info',
         'version': 1,
         'method': 'query'
     }
-    response = requests.get(endpoint, params=params)
-    if response.status_code != 200:
-        raise SynologyPhotoError(f"Request failed: {response.status_code}")
-
-    data = response.json()
-    if not data['success']:
-        raise SynologyPhotoError(f"Failed to get API Info: {data['error']['code']}")
-    
-    return data['data']
+    return _call(endpoint, params, "Failed to get API Info")
 
 def get_folders(sid: str, folder_id: Optional[int] = None) -> List[Dict[str, Any]]:
     """Retrieve folders from Synology Photo.
@@ -95,33 +231,78 @@ def get_folders(sid: str, folder_id: Optional[int] = None) -> List[Dict[str, Any
     Raises:
         SynologyPhotoError: If the folder request fails.
     """
-    endpoint = urljoin(os.getenv('SYNOLOGY_PHOTO_URL'), 'webapi/entry.cgi')
-    params = {
-        'api': 'SYNO.Foto.Browse.Folder',
-        'version': 2,
-        'id': folder_id,
-        'method': 'list',
-        '_sid': sid,
-        'offset': 0,
-        'limit': 100,
-    }
-    response = requests.get(endpoint, params=params)
-    if response.status_code != 200:
-        raise SynologyPhotoError(f"Request failed: {response.status_code}")
+    endpoint = _endpoint('webapi/entry.cgi')
+    params = {**_FOLDERS_PARAMS, '_sid': sid, 'id': folder_id}
+    return list(_iter_pages(endpoint, params, "Failed to get root folders"))
 
-    data = response.json()
-    if not data['success']:
-        raise SynologyPhotoError(f"Failed to get root folders: {data['error']['code']}")
+def iter_items(sid: str, folder_id: Optional[int] = None,
+               additional: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+    """Iterate over items (photos/videos) of a single folder, page by page.
+
+    Args:
+        sid: Session ID from authentication.
+        folder_id: Optional ID of the folder to list items from.
+        additional: Optional extra information to include in each item (e.g. ["tag"]).
+
+    Yields:
+        Dict[str, Any]: Item information dictionaries.
+
+    Raises:
+        SynologyPhotoError: If the items request fails.
+    """
+    endpoint = _endpoint('webapi/entry.cgi')
+    params = {**_ITEMS_PARAMS, '_sid': sid, 'folder_id': folder_id, 'additional': _json_dumps(additional or [])}
+    yield from _iter_pages(endpoint, params, "Failed to get items")
+
+def _list_folder(sid: str, folder_id: Optional[int],
+                 additional: Optional[List[str]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """List the items and the subfolders of a single folder."""
+    return list(iter_items(sid, folder_id, additional)), get_folders(sid, folder_id)
 
-    return data['data']['list']
+def iter_items_concurrent(sid: str, root_id: Optional[int] = None, additional: Optional[List[str]] = None,
+                          max_workers: int = MAX_WORKERS) -> Iterator[Dict[str, Any]]:
+    """Iterate over items (photos/videos) of a folder and all its subfolders.
 
-def get_items(sid: str, folder_id: Optional[int] = None, recursive: bool = False) -> List[Dict[str, Any]]:
+    Folders are listed in parallel by a thread pool owned by this walk,
+    sharing the session connection pool. Subfolders are listed in the order
+    their parent listings complete, and items are yielded as soon as their
+    folder is listed, so their order is not deterministic.
+
+    Args:
+        sid: Session ID from authentication.
+        root_id: Optional ID of the folder to start from.
+        additional: Optional extra information to include in each item (e.g. ["tag"]).
+        max_workers: Maximum number of folders listed at the same time by this walk.
+
+    Yields:
+        Dict[str, Any]: Item information dictionaries.
+
+    Raises:
+        SynologyPhotoError: If a folder or items request fails.
+    """
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        pending = {executor.submit(_list_folder, sid, root_id, additional)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                items, folders = future.result()
+                yield from items
+                pending.update(executor.submit(_list_folder, sid, folder['id'], additional) for folder in folders)
+    finally:
+        # Cancel the listings not started yet if the walk failed or was stopped early.
+        # This still waits for the listings already running to finish.
+        executor.shutdown(cancel_futures=True)
+
+def get_items(sid: str, folder_id: Optional[int] = None, recursive: bool = False,
+              additional: Optional[List[str]] = None) -> List[Dict[str, Any]]:
     """Retrieve items (photos/videos) from Synology Photo API.
 
     Args:
         sid: Session ID from authentication.
         folder_id: Optional ID of the folder to list items from.
         recursive: If True, retrieves items from all subfolders recursively.
+        additional: Optional extra information to include in each item (e.g. ["tag"]).
 
     Returns:
         List[Dict[str, Any]]: List of item information dictionaries.
@@ -129,63 +310,65 @@ def get_items(sid: str, folder_id: Optional[int] = None, recursive: bool = False
     Raises:
         SynologyPhotoError: If the items request fails.
     """
-    endpoint = urljoin(os.getenv('SYNOLOGY_PHOTO_URL'), 'webapi/entry.cgi')
+    if recursive:
+        return list(iter_items_concurrent(sid, folder_id, additional))
+    return list(iter_items(sid, folder_id, additional))
+
+@lru_cache(maxsize=1)
+def _fetch_all_tags(sid: str) -> Tuple[Dict[str, Any], ...]:
+    """Fetch all tags once per session ID, as an immutable tuple shared by the callers."""
+    endpoint = _endpoint('webapi/entry.cgi')
     params = {
-        'api': 'SYNO.Foto.Browse.Item',
-        'version': 4,
-        'folder_id': folder_id,
+        'api': 'SYNO.Foto.Browse.GeneralTag',
+        'version': 1,
         'method': 'list',
         '_sid': sid,
-        'offset': 0,
-        'limit': 100,
-        'additional': '["tag"]'
     }
-    response = requests.get(endpoint, params=params)
-    if response.status_code != 200:
-        raise SynologyPhotoError(f"Request failed: {response.status_code}")
-
-    data = response.json()
-    if not data['success']:
-        raise SynologyPhotoError(f"Failed to get items: {data['error']['code']}")
-    
-    items = data['data']['list']
-    
-    if recursive:
-        for folder in get_folders(sid, folder_id):
-            items.extend(get_items(sid, folder['id'], recursive=True))
-    
-    return items
+    return tuple(_iter_pages(endpoint, params, "Failed to get all tags"))
 
 def get_all_tags(sid: str) -> List[Dict[str, Any]]:
     """Retrieve all tags from Synology Photo API.
 
+    The tags are cached for the last session ID. Call
+    `clear_tag_cache()` after creating new tags.
+
     Args:
         sid: Session ID from authentication.
 
     Returns:
-        List[Dict[str, Any]]: List of tag information dictionaries.
+        List[Dict[str, Any]]: List of tag information dictionaries (copies of the cache).
 
     Raises:
         SynologyPhotoError: If the tags request fails.
     """
-    endpoint = urljoin(os.getenv('SYNOLOGY_PHOTO_URL'), 'webapi/entry.cgi')
-    params = {
-        'api': 'SYNO.Foto.Browse.GeneralTag',
-        'version': 1,
-        'method': 'list',
-        '_sid': sid,  
-        'limit': 100,
-        'offset': 0,
-    }
-    response = requests.get(endpoint, params=params)
-    if response.status_code != 200:
-        raise SynologyPhotoError(f"Request failed: {response.status_code}")
+    return [dict(tag) for tag in _fetch_all_tags(sid)]
 
-    data = response.json()
-    if not data['success']:
-        raise SynologyPhotoError(f"Failed to get all tags: {data['error']['code']}")
+@lru_cache(maxsize=1)
+def _tag_index(sid: str) -> Dict[str, Dict[str, Any]]:
+    """Index the cached tags by name. The index and its tags are shared, never return them as is."""
+    return {tag['name']: tag for tag in _fetch_all_tags(sid)}
+
+def get_tag_index(sid: str) -> Dict[str, Dict[str, Any]]:
+    """Retrieve all tags indexed by their name.
 
-    return data['data']['list']
+    The tags are cached for the last session ID. Call
+    `clear_tag_cache()` after creating new tags.
+
+    Args:
+        sid: Session ID from authentication.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Tag information dictionaries by tag name (copies of the cache).
+
+    Raises:
+        SynologyPhotoError: If the tags request fails.
+    """
+    return {name: dict(tag) for name, tag in _tag_index(sid).items()}
+
+def clear_tag_cache() -> None:
+    """Clear the cached tag list and tag index, so the next lookup fetches the tags again."""
+    _fetch_all_tags.cache_clear()
+    _tag_index.cache_clear()
 
 def get_tag(sid: str, tag_name: str) -> Dict[str, Any]:
     """Retrieve a specific tag by name.
@@ -195,20 +378,36 @@ def get_tag(sid: str, tag_name: str) -> Dict[str, Any]:
         tag_name: Name of the tag to retrieve.
 
     Returns:
-        Dict[str, Any]: Tag information dictionary.
+        Dict[str, Any]: Tag information dictionary (a copy of the cache).
 
     Raises:
         SynologyPhotoError: If the tag is not found or request fails.
     """
-    tags = get_all_tags(sid)
-    for tag in tags:
-        if tag['name'] == tag_name:
-            return tag
-    raise SynologyPhotoError(f"Tag '{tag_name}' not found.")
+    try:
+        return dict(_tag_index(sid)[tag_name])
+    except KeyError:
+        raise SynologyPhotoError(f"Tag '{tag_name}' not found.") from None
+
+def _add_tag_request(sid: str, item_ids: List[int], tag_ids: List[int], post: bool) -> None:
+    """Send a single add_tag request, as a GET or as a POST with a form body."""
+    endpoint = _endpoint('webapi/entry.cgi')
+    params = {
+        'api': 'SYNO.Foto.Browse.Item',
+        'version': 1,
+        'method': 'add_tag',
+        '_sid': sid,
+        'id': _json_dumps(item_ids),
+        'tag': _json_dumps(tag_ids),
+    }
+    _call(endpoint, params, "Failed to add tags", post=post)
 
 def add_tag(sid: str, item_ids: List[int], tag_ids: List[int]) -> None:
     """Add tags to specified items.
 
+    Up to ADD_TAG_CHUNK_SIZE items are tagged with a single GET request.
+    Larger lists are split into chunks sent in parallel as POST requests,
+    to stay below URL length limits.
+
     Args:
         sid: Session ID from authentication.
         item_ids: List of item IDs to tag.
@@ -217,20 +416,12 @@ def add_tag(sid: str, item_ids: List[int], tag_ids: List[int]) -> None:
     Raises:
         SynologyPhotoError: If adding tags fails.
     """
-    endpoint = urljoin(os.getenv('SYNOLOGY_PHOTO_URL'), 'webapi/entry.cgi')
-    params = {
-        'api': 'SYNO.Foto.Browse.Item',
-        'version': 1,
-        'method': 'add_tag',
-        '_sid': sid,
-        'id': json.dumps(item_ids),    
-        'tag': json.dumps(tag_ids),    
-    }
-
-    response = requests.get(endpoint, params=params)
-    if response.status_code != 200:
-        raise SynologyPhotoError(f"Request failed: {response.status_code}")
-
-    data = response.json()
-    if not data['success']:
-        raise SynologyPhotoError(f"Failed to add tags: {data['error']['code']}")
\ No newline at end of file
+    if len(item_ids) <= ADD_TAG_CHUNK_SIZE:
+        _add_tag_request(sid, item_ids, tag_ids, post=False)
+        return
+
+    chunks = [item_ids[i:i + ADD_TAG_CHUNK_SIZE] for i in range(0, len(item_ids), ADD_TAG_CHUNK_SIZE)]
+    with ThreadPoolExecutor(max_workers=min(len(chunks), ADD_TAG_WORKERS)) as executor:
+        futures = [executor.submit(_add_tag_request, sid, chunk, tag_ids, True) for chunk in chunks]
+        for future in futures:
+            future.result()
@@ -4,15 +4,19 @@ AddTags.py - Batch tag application script for Synology Photos
 This script automatically applies team-specific tags to all photos in corresponding team folders.
 It uses the Synology Photos API to:
 1. Authenticate with the Synology Photos system
-2. Process each team's folder recursively
-3. Apply the corresponding team tag to all photos in that folder
+2. Process each team's folder recursively, several teams in parallel
+3. Apply the corresponding team tag to all photos in that folder, while the
+   folder is still being walked
 """
 
 from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 import os
+import queue
 import sys
-from SynologyPhotoLib import authenticate, get_items, add_tag, get_tag, SynologyPhotoError
+import threading
+from SynologyPhotoLib import authenticate, iter_items_concurrent, add_tag, get_tag, SynologyPhotoError, ADD_TAG_CHUNK_SIZE
 
 # Mapping of team names to their folder IDs in Synology Photos
 team_folders_id: Dict[str, int] = {
@@ -33,24 +37,97 @@ team_folders_id: Dict[str, int] = {
     "1LNM": 2977
 }
 
-def process_team(sid: str, team_name: str, folder_id: int) -> None:
+# Number of teams processed in parallel
+MAX_PARALLEL_TEAMS = 8
+
+# Number of folders listed in parallel by each team's folder walk. All requests of
+# the script stay bounded by SynologyPhotoLib.MAX_CONCURRENT_REQUESTS.
+WALK_WORKERS_PER_TEAM = 2
+
+# Maximum number of item IDs waiting to be tagged for a team
+ITEMS_QUEUE_SIZE = 1000
+
+# Marker pushed on the queue once a team folder has been fully walked
+_DONE = object()
+
+def produce_items_ids(sid: str, folder_id: int, items_queue: queue.Queue,
+                      stop: threading.Event, errors: List[Exception]) -> None:
+    """
+    Walk a team's folder and push the ID of every item onto a queue.
+
+    Args:
+        sid: Session ID from authentication
+        folder_id: ID of the team's folder in Synology Photos
+        items_queue: Queue receiving the item IDs, then _DONE
+        stop: Event set by the consumer to stop the walk early
+        errors: List receiving the exception that stopped the walk, if any
+    """
+    try:
+        for item in iter_items_concurrent(sid, folder_id, additional=[], max_workers=WALK_WORKERS_PER_TEAM):
+            if stop.is_set():
+                return
+            items_queue.put(item['id'])
+    except Exception as e:
+        errors.append(e)
+    finally:
+        items_queue.put(_DONE)
+
+def process_team(sid: str, team_name: str, folder_id: int, tag_id: int) -> None:
     """
     Process a single team's folder and apply team tags to all photos.
 
     Args:
         sid: Session ID from authentication
-        team_name: Name of the team (used for tagging)
+        team_name: Name of the team (used for logging)
         folder_id: ID of the team's folder in Synology Photos
+        tag_id: ID of the team's tag in Synology Photos
 
     Raises:
         SynologyPhotoError: If any API operation fails
     """
     try:
         print(f"Processing team {team_name}...")
-        items = get_items(sid, folder_id, recursive=True)
-        items_ids = [item['id'] for item in items]
-        tag_id = get_tag(sid, team_name)['id']
-        add_tag(sid, items_ids, [tag_id])
+        items_queue = queue.Queue(maxsize=ITEMS_QUEUE_SIZE)
+        stop = threading.Event()
+        errors: List[Exception] = []
+        producer = threading.Thread(target=produce_items_ids, args=(sid, folder_id, items_queue, stop, errors), daemon=True)
+        producer.start()
+
+        # Tag items chunk by chunk while the folder is still being walked.
+        # An item can be listed more than once, tag each one only once.
+        seen_ids = set()
+        chunk: List[int] = []
+        done = False
+        try:
+            while True:
+                item_id = items_queue.get()
+                if item_id is _DONE:
+                    done = True
+                    break
+                if item_id in seen_ids:
+                    continue
+                seen_ids.add(item_id)
+                chunk.append(item_id)
+                if len(chunk) == ADD_TAG_CHUNK_SIZE:
+                    add_tag(sid, sorted(chunk), [tag_id])
+                    chunk = []
+            # Also tag the items listed before a walk error, then report the team as partially tagged
+            if chunk:
+                add_tag(sid, sorted(chunk), [tag_id])
+            if errors:
+                if not isinstance(errors[0], SynologyPhotoError):
+                    raise errors[0]
+                raise SynologyPhotoError(
+                    f"{errors[0]} (partially tagged: {len(seen_ids)} items tagged before the error)"
+                ) from errors[0]
+        finally:
+            if not done:
+                # Stop the walk and unblock the producer if it waits on a full queue.
+                # The producer only checks `stop` between items, so this waits until
+                # the walk yields its next item, i.e. at most one more folder listing.
+                stop.set()
+                while items_queue.get() is not _DONE:
+                    pass
     except SynologyPhotoError as e:
         print(f"Error processing team {team_name}: {str(e)}", file=sys.stderr)
 
@@ -72,9 +149,17 @@ if __name__ == "__main__":
             os.getenv('SYNOLOGY_PHOTO_PASSWORD')
         )
         
-        print(f"Processing {len(team_folders_id)} teams...")
+        # Resolve all team tags once, before processing the teams
+        teams = []
         for team_name, folder_id in team_folders_id.items():
-            process_team(sid, team_name, folder_id)
+            try:
+                teams.append((team_name, folder_id, get_tag(sid, team_name)['id']))
+            except SynologyPhotoError as e:
+                print(f"Error processing team {team_name}: {str(e)}", file=sys.stderr)
+
+        print(f"Processing {len(teams)} teams...")
+        with ThreadPoolExecutor(max_workers=MAX_PARALLEL_TEAMS) as executor:
+            list(executor.map(lambda team: process_team(sid, *team), teams))
             
         print("All teams processed successfully")
     except SynologyPhotoError as e: